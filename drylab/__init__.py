@@ -5,13 +5,19 @@ from .types import (
     Timestamp,
     Event,
     EventHeader,
-    EventRow
+    EventRow,
+    EventRef,
+    EventRecord,
+    HeaderRecord,
+    RunDiff
 )
 from .ledger import Ledger
 from .reactor import Reactor
 from .schema_registry import validate_schema
 from .validators import EventValidator
 from .pipeline import Pipeline
+from .columnar import export_parquet, import_parquet
+from .tabular import encode_arrow
 
 __all__ = [
     'Blob',
@@ -21,9 +27,16 @@ __all__ = [
     'Event',
     'EventHeader',
     'EventRow',
+    'EventRef',
+    'EventRecord',
+    'HeaderRecord',
+    'RunDiff',
     'Ledger',
     'Reactor',
     'validate_schema',
     'EventValidator',
-    'Pipeline'
+    'Pipeline',
+    'export_parquet',
+    'import_parquet',
+    'encode_arrow'
 ]
\ No newline at end of file
@@ -0,0 +1,256 @@
+# drylab/columnar.py
+"""
+Columnar (Parquet) export and bulk import of a Ledger.
+
+pyarrow is an optional dependency: ``pip install drylab[arrow]``.
+
+Layout of an export directory::
+
+    events.parquet              run_id, seq, sha, schema, ts
+    blobs.parquet               sha, bytes
+    forks.parquet               run_id, parent_run, parent_seq
+    edges.parquet               child, parent
+    tables/<SCHEMA>/part-<i>.parquet    decoded tabular payloads (tables=True)
+"""
+from __future__ import annotations
+
+import hashlib
+from pathlib import Path
+
+from .ledger import Ledger
+from .tabular import TABULAR_SCHEMAS, _decode, _pyarrow
+from .types import SchemaId
+
+# table name -> (columns, arrow type names) in export order
+_TABLES = {
+    "events": (("run_id", "seq", "sha", "schema", "ts"),
+               ("string", "int64", "string", "string", "int64")),
+    "blobs":  (("sha", "bytes"), ("string", "binary")),
+    "forks":  (("run_id", "parent_run", "parent_seq"), ("string", "string", "int64")),
+    "edges":  (("child", "parent"), ("string", "string")),
+}
+
+_ROWS_PER_FILE = 1 << 20                      # per tables/<SCHEMA> part file
+
+
+def _arrow_schema(pa, table: str):
+    cols, types = _TABLES[table]
+    return pa.schema([(c, getattr(pa, t)()) for c, t in zip(cols, types)])
+
+
+# ------------------------------------------------------------------ export
+def export_parquet(
+    ledger: Ledger,
+    path: str | Path,
+    *,
+    tables: bool = False,
+    batch_size: int = 10_000,
+) -> None:
+    """
+    Stream the ledger into Parquet files under *path*.
+
+    Rows are fetched incrementally from the cursor and written *batch_size*
+    at a time, so memory stays bounded regardless of ledger size.  With
+    *tables* the payloads of ``TABULAR_SCHEMAS`` (CSV or Arrow IPC) are
+    additionally decoded into one Parquet dataset per schema under
+    ``tables/<SCHEMA>/``, with the union of all payload columns and a
+    ``sha`` column linking each row back to the event log.
+
+    Raises
+    ------
+    ValueError
+        If *batch_size* is smaller than 1.
+    """
+    if batch_size < 1:
+        raise ValueError(f"batch_size must be >= 1, got {batch_size}")
+    pa = _pyarrow()
+    out = Path(path)
+    out.mkdir(parents=True, exist_ok=True)
+
+    # every file comes from the same snapshot, even with concurrent writers
+    own_txn = not ledger._db.in_transaction
+    if own_txn:
+        ledger._db.execute("BEGIN")
+    try:
+        _export(pa, ledger, out, tables, batch_size)
+    finally:
+        if own_txn:
+            ledger._db.commit()
+
+
+def _export(pa, ledger: Ledger, out: Path, tables: bool, batch_size: int) -> None:
+    for table, (cols, _) in _TABLES.items():
+        schema = _arrow_schema(pa, table)
+        cur = ledger._db.execute(f"SELECT {', '.join(cols)} FROM {table}")
+        with pa.parquet.ParquetWriter(out / f"{table}.parquet", schema) as writer:
+            while rows := cur.fetchmany(batch_size):
+                columns = list(zip(*rows))
+                writer.write_batch(pa.record_batch(
+                    [pa.array(c, type=f.type) for c, f in zip(columns, schema)],
+                    schema=schema,
+                ))
+
+    if not tables:
+        return
+    for schema_id in sorted(TABULAR_SCHEMAS):
+        _export_tables(pa, ledger, schema_id, out / "tables" / schema_id.replace("@", ".v"), batch_size)
+
+
+def _unify(pa, a, b):
+    """Merge two table schemas, promoting types; irreconcilable columns become strings."""
+    try:
+        return pa.unify_schemas([a, b], promote_options="permissive")
+    except pa.ArrowTypeError:
+        theirs = {f.name: f for f in b}
+        clash = set()
+        for f in a:
+            if f.name in theirs:
+                try:
+                    pa.unify_schemas([pa.schema([f]), pa.schema([theirs[f.name]])],
+                                     promote_options="permissive")
+                except pa.ArrowTypeError:
+                    clash.add(f.name)
+
+        def relax(schema):
+            return pa.schema([f.with_type(pa.string()) if f.name in clash else f for f in schema])
+
+        return pa.unify_schemas([relax(a), relax(b)], promote_options="permissive")
+
+
+def _export_tables(pa, ledger: Ledger, schema_id: SchemaId, dataset: Path, batch_size: int) -> None:
+    """
+    Write every payload of *schema_id* into one Parquet dataset at *dataset*.
+
+    Payloads rarely share columns (e.g. different samples per counts
+    matrix), so a first pass unifies their schemas and the second writes
+    each table conformed to it, missing columns as nulls.
+    """
+    def payloads():
+        cur = ledger._db.execute(
+            "SELECT sha, bytes FROM blobs "
+            "WHERE sha IN (SELECT sha FROM events WHERE schema = ?)",
+            (schema_id,),
+        )
+        while rows := cur.fetchmany(batch_size):
+            for sha, blob in rows:
+                yield sha, _decode(blob)      # bypass the LRU: each blob is read once
+
+    unified = None
+    for _, tbl in payloads():
+        unified = tbl.schema if unified is None else _unify(pa, unified, tbl.schema)
+    if unified is None:
+        return
+    fields = list(unified)
+    unified = unified.append(pa.field("sha", pa.string()))
+
+    def batches():
+        for sha, tbl in payloads():
+            n = tbl.num_rows
+            columns = [
+                tbl.column(f.name).cast(f.type) if f.name in tbl.column_names
+                else pa.nulls(n, f.type)
+                for f in fields
+            ]
+            columns.append(pa.array([sha] * n, pa.string()))
+            yield from pa.table(columns, schema=unified).to_batches()
+
+    pa.dataset.write_dataset(
+        batches(),
+        dataset,
+        schema=unified,
+        format="parquet",
+        basename_template="part-{i}.parquet",
+        max_rows_per_file=_ROWS_PER_FILE,
+        max_rows_per_group=_ROWS_PER_FILE,
+        existing_data_behavior="delete_matching",
+    )
+
+
+# ------------------------------------------------------------------ import
+_RUN_TABLES = ("events", "forks")             # rows keyed by run_id
+
+
+def import_parquet(
+    ledger: Ledger,
+    path: str | Path,
+    *,
+    verify: bool = True,
+    skip_existing_runs: bool = False,
+    batch_size: int = 10_000,
+) -> int:
+    """
+    Bulk-load an :func:`export_parquet` directory into *ledger*.
+
+    Everything is inserted in a single transaction with ``executemany``.
+    Runs are imported whole: a run_id that already exists in *ledger* is an
+    error unless *skip_existing_runs* is set, in which case that run (and
+    any run forked from it) is left out.  Blobs and edges are content
+    addressed and merged.  JSON-Schema validation is skipped (the export
+    came out of a ledger), but with *verify* every blob is re-hashed so
+    corrupted bytes are rejected.
+
+    Returns the number of event rows inserted.
+
+    Raises
+    ------
+    ValueError
+        If a run in the export already exists in *ledger* (and
+        *skip_existing_runs* is not set), if an imported event's blob is in
+        neither the export nor *ledger*, or if *verify* is set and a blob
+        does not match its sha, or if *batch_size* is smaller than 1.
+    """
+    if batch_size < 1:
+        raise ValueError(f"batch_size must be >= 1, got {batch_size}")
+    pa = _pyarrow()
+    src = Path(path)
+    files = {t: src / f"{t}.parquet" for t in _TABLES}
+
+    def batches(table: str):
+        cols = list(_TABLES[table][0])
+        if not files[table].exists():
+            return
+        for batch in pa.parquet.ParquetFile(files[table]).iter_batches(batch_size, columns=cols):
+            yield list(zip(*(batch.column(c).to_pylist() for c in cols)))
+
+    # 1. Runs in the export that collide with runs already in the ledger
+    runs: set[str] = set()
+    for table in _RUN_TABLES:
+        if files[table].exists():
+            col = pa.parquet.read_table(files[table], columns=["run_id"]).column("run_id")
+            runs.update(col.unique().to_pylist())
+    existing = {run for run in runs if ledger._exists(run)}
+    if existing and not skip_existing_runs:
+        raise ValueError(f"Runs already exist in the ledger: {sorted(existing)}")
+    # forks of a skipped run would resolve against the ledger's run instead
+    forks = [r for rows in batches("forks") for r in rows]
+    while grown := {run for run, parent, _ in forks if parent in existing} - existing:
+        existing |= grown
+
+    # 2. Insert; new event rows get rowids above the current maximum
+    first_rowid = ledger._db.execute("SELECT COALESCE(MAX(rowid), 0) FROM events").fetchone()[0]
+    with ledger._db:
+        for table, (cols, _) in _TABLES.items():
+            verb = "INSERT" if table in _RUN_TABLES else "INSERT OR IGNORE"
+            sql = (f"{verb} INTO {table} ({', '.join(cols)}) "
+                   f"VALUES ({', '.join('?' * len(cols))})")
+            for rows in batches(table):
+                if table in _RUN_TABLES and existing:
+                    rows = [r for r in rows if r[0] not in existing]
+                if verify and table == "blobs":
+                    for sha, blob in rows:
+                        if hashlib.sha256(blob).hexdigest() != sha:
+                            raise ValueError(f"Blob does not match its sha: {sha}")
+                ledger._db.executemany(sql, rows)
+
+        # 3. Every imported event must resolve to a blob (rolls back if not)
+        missing = ledger._db.execute(
+            "SELECT e.sha FROM events e LEFT JOIN blobs b ON b.sha = e.sha "
+            "WHERE e.rowid > ? AND b.sha IS NULL LIMIT 1",
+            (first_rowid,),
+        ).fetchone()
+        if missing:
+            raise ValueError(f"Imported event references a missing blob: {missing[0]}")
+
+    return ledger._db.execute(
+        "SELECT COUNT(*) FROM events WHERE rowid > ?", (first_rowid,)
+    ).fetchone()[0]
@@ -1,9 +1,12 @@
 import hashlib
 import sqlite3
 from pathlib import Path
-from typing import Iterator
+from typing import Callable, Iterable, Iterator
 from .validators import EventValidator
-from .types import Blob, EventHeader, EventRow, SchemaId, Sha256
+from .types import (
+    Blob, EventHeader, EventRecord, EventRef, EventRow, HeaderRecord,
+    RunDiff, SchemaId, Sha256, Timestamp,
+)
 from .schema_registry import validate_schema
 import asyncio
 
@@ -21,8 +24,27 @@ CREATE TABLE IF NOT EXISTS events (
     ts     INTEGER,
     PRIMARY KEY (run_id, seq)
 );
+CREATE INDEX IF NOT EXISTS events_run_schema_sha ON events (run_id, schema, sha);
+CREATE INDEX IF NOT EXISTS events_schema_ts ON events (schema, ts, run_id, seq);
+CREATE INDEX IF NOT EXISTS events_ts ON events (ts, run_id, seq);
+CREATE INDEX IF NOT EXISTS events_run_ts ON events (run_id, ts, seq);
+-- a forked run inherits events (parent_run, seq <= parent_seq) without copying them
+CREATE TABLE IF NOT EXISTS forks (
+    run_id     TEXT PRIMARY KEY,
+    parent_run TEXT,
+    parent_seq INTEGER
+);
+-- provenance: artefact *child* was produced from artefact *parent*
+CREATE TABLE IF NOT EXISTS edges (
+    child  TEXT,
+    parent TEXT,
+    PRIMARY KEY (child, parent)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS edges_parent ON edges (parent, child);
 """
 
+_SEGMENT_SQL = "SELECT seq, sha, schema, ts FROM events WHERE run_id = ? AND seq > ?"
+
 
 class Ledger:
     def __init__(self, path: str | Path = ":memory:") -> None:
@@ -35,6 +57,106 @@ class Ledger:
     def _hash(blob: Blob) -> Sha256:
         return Sha256(hashlib.sha256(blob).hexdigest())
 
+    # ------------------------------------------------ fork resolution
+    def _segments(self, run_id: str) -> list[tuple[str, int, int | None]]:
+        """
+        Resolve *run_id* into the physical (run_id, lo, hi) ranges it is made
+        of, oldest ancestor first.  Each range covers ``lo < seq <= hi`` (an
+        open upper bound is ``None``); ranges never overlap, so concatenating
+        them yields the run in seq order.
+        """
+        segments: list[tuple[str, int, int | None]] = []
+        cur, hi = run_id, None
+        while True:
+            row = self._db.execute(
+                "SELECT parent_run, parent_seq FROM forks WHERE run_id=?", (cur,)
+            ).fetchone()
+            if row is None:
+                segments.append((cur, 0, hi))
+                break
+            parent_run, parent_seq = row
+            segments.append((cur, parent_seq, hi))
+            hi = parent_seq if hi is None else min(hi, parent_seq)
+            cur = parent_run
+        segments.reverse()
+        return segments
+
+    def _events_sql(self, run_id: str, cursor: int = 0) -> tuple[str, list]:
+        """SELECT (seq, sha, schema, ts) over *run_id* incl. inherited events, seq > cursor."""
+        parts, params = [], []
+        for seg_run, lo, hi in self._segments(run_id):
+            if hi is not None and hi <= max(lo, cursor):
+                continue                        # empty or already consumed
+            sql, p = _SEGMENT_SQL, [seg_run, max(lo, cursor)]
+            if hi is not None:
+                sql += " AND seq <= ?"
+                p.append(hi)
+            parts.append(sql)
+            params.extend(p)
+        if not parts:                           # keep the column shape
+            return _SEGMENT_SQL + " AND 0", [run_id, cursor]
+        return " UNION ALL ".join(parts), params
+
+    def _contains(self, run_id: str, schema_id: SchemaId, sha: Sha256) -> bool:
+        """Whether (schema_id, sha) is logged in *run_id*, incl. inherited events."""
+        parts, params = [], []
+        for seg_run, lo, hi in self._segments(run_id):
+            # probe the (run_id, schema, sha) index; seq bounds are residual
+            sql = ("SELECT 1 FROM events INDEXED BY events_run_schema_sha "
+                   "WHERE run_id = ? AND schema = ? AND sha = ?")
+            p = [seg_run, schema_id, sha]
+            if lo:
+                sql += " AND seq > ?"
+                p.append(lo)
+            if hi is not None:
+                sql += " AND seq <= ?"
+                p.append(hi)
+            parts.append(sql)
+            params.extend(p)
+        return self._db.execute(
+            " UNION ALL ".join(parts) + " LIMIT 1", params
+        ).fetchone() is not None
+
+    def _rows(self, run_id: str, cursor: int = 0) -> sqlite3.Cursor:
+        """Cursor over (seq, sha, schema, ts, bytes) of *run_id* after *cursor*."""
+        sql, params = self._events_sql(run_id, cursor)
+        # LEFT JOIN: a missing blob must surface as KeyError, not drop the row
+        return self._db.execute(
+            f"SELECT e.seq, e.sha, e.schema, e.ts, b.bytes "
+            f"FROM ({sql}) e LEFT JOIN blobs b ON b.sha = e.sha ORDER BY e.seq",
+            params,
+        )
+
+    @staticmethod
+    def _row(run_id: str, seq: int, sha: str, schema: str, ts: int, blob: bytes | None) -> EventRow:
+        # rows read back from the ledger were validated on publish
+        if blob is None:
+            raise KeyError(sha)
+        header = EventHeader.model_construct(id=sha, schema_id=schema, ts=ts)
+        return EventRow.model_construct(header=header, blob=blob, run_id=run_id, seq=seq)
+
+    @staticmethod
+    def _record(run_id: str, seq: int, sha: str, schema: str, ts: int, blob: bytes | None) -> EventRecord:
+        if blob is None:
+            raise KeyError(sha)
+        return EventRecord(HeaderRecord(sha, schema, ts), blob, run_id, seq)
+
+    def _head(self, run_id: str) -> int:
+        """Highest seq visible in *run_id* (0 for an unknown or empty run)."""
+        own = self._db.execute(
+            "SELECT MAX(seq) FROM events WHERE run_id=?", (run_id,)
+        ).fetchone()[0]
+        fork = self._db.execute(
+            "SELECT parent_seq FROM forks WHERE run_id=?", (run_id,)
+        ).fetchone()
+        return max(own or 0, fork[0] if fork else 0)
+
+    def _exists(self, run_id: str) -> bool:
+        return bool(
+            self._db.execute("SELECT 1 FROM events WHERE run_id=? LIMIT 1", (run_id,)).fetchone()
+            or self._db.execute("SELECT 1 FROM forks WHERE run_id=?", (run_id,)).fetchone()
+        )
+
     # ------------------------------------------------ api
      # internal: set by publish() when a new row is committed
     _condition = asyncio.Condition()
@@ -46,25 +168,12 @@ class Ledger:
         generator returns so the calling reactor can finish.
         """
         while True:
-            rows = self._db.execute(
-                "SELECT seq, sha, schema, ts "
-                "FROM   events "
-                "WHERE  run_id = ? AND seq > ? "
-                "ORDER  BY seq",
-                (run_id, cursor),
-            ).fetchall()
+            rows = self._rows(run_id, cursor).fetchall()    # resolves forked prefixes
 
             if rows:
-                for seq, sha, schema, ts in rows:
-                    cursor = seq               # ← update BEFORE yield
-                    header = EventHeader(id=sha, schema=schema, ts=ts)
-                    blob   = self.cat(sha)
-                    yield EventRow(
-                        header=header,
-                        blob=blob,
-                        run_id=run_id,
-                        seq=seq,
-                    )
+                for row in rows:
+                    cursor = row[0]            # ← update BEFORE yield
+                    yield self._row(run_id, *row)
                 # → loop immediately to fetch rows newer than the final seq
                 continue
 
@@ -81,10 +190,13 @@ class Ledger:
     # drylab/ledger.py  (inside class Ledger)
     # ---------------------------------------------------------------
     # drylab/ledger.py  ───────────────────────────────────────────────────
-    def publish(self, event: EventRow) -> bool:
+    def publish(self, event: EventRow, parents: Iterable[Sha256] = ()) -> bool:
         """
         Store *event* exactly once.
 
+        *parents* are the shas of the artefacts *event* was derived from; the
+        edges are recorded even when the event itself is a duplicate.
+
         Returns
         -------
         bool
@@ -103,29 +215,30 @@ class Ledger:
 
         run_id, schema_id, sha = event.run_id, event.header.schema_id, event.header.id
 
-        # 2. Skip if artefact already logged for this run
-        exists = self._db.execute(
-            "SELECT 1 FROM events WHERE run_id=? AND schema=? AND sha=?",
-            (run_id, schema_id, sha)
-        ).fetchone()
-        if exists:
+        # provenance edges are sha-level, shared across runs
+        edges = [(sha, parent) for parent in parents]
+        edges_sql = "INSERT OR IGNORE INTO edges (child, parent) VALUES (?,?)"
+
+        # 2. Skip if artefact already logged for this run (incl. inherited prefix)
+        if self._contains(run_id, schema_id, sha):
+            if edges:                            # still record the new derivation
+                with self._db:
+                    self._db.executemany(edges_sql, edges)
             return False                         # duplicate → caller may ignore
 
-        # 3. Insert blob (dedup on sha) + new event row
+        # 3. Insert blob (dedup on sha) + new event row + its edges, atomically
         with self._db:
             self._db.execute(
                 "INSERT OR IGNORE INTO blobs (sha, bytes) VALUES (?,?)",
                 (sha, event.blob),
             )
-            seq = self._db.execute(
-                "SELECT COALESCE(MAX(seq),0)+1 FROM events WHERE run_id=?",
-                (run_id,),
-            ).fetchone()[0]
+            seq = self._head(run_id) + 1
             self._db.execute(
                 "INSERT INTO events(run_id, seq, sha, schema, ts) "
                 "VALUES(?, ?, ?, ?, strftime('%s','now')*1000)",
                 (run_id, seq, sha, schema_id),
             )
+            self._db.executemany(edges_sql, edges)
 
         # 4. Notify subscribers about the new row
         asyncio.create_task(self._notify())
@@ -142,26 +255,238 @@ class Ledger:
             raise KeyError(sha)
         return row[0]
 
-    def tail(self, run_id: str, from_seq: int = 0) -> Iterator[EventRow]:
+    def _batches(
+        self,
+        run_id: str,
+        from_seq: int,
+        batch_size: int,
+        validate: bool,
+        make: Callable[..., EventRow | EventRecord],
+    ) -> Iterator[list]:
         cursor = from_seq
         while True:
+            rows = self._rows(run_id, cursor)
+            found = False
+            while chunk := rows.fetchmany(batch_size):
+                found = True
+                batch = [make(run_id, *row) for row in chunk]
+                if validate:
+                    for event in batch:
+                        validator = EventValidator(event)
+                        if not validator.validate():
+                            raise ValueError(f"Invalid event in database: {validator.validation_error}")
+                yield batch
+                cursor = chunk[-1][0]
+            if not found:
+                break
+
+    def tail(
+        self, run_id: str, from_seq: int = 0, *, validate: bool = True
+    ) -> Iterator[EventRow]:
+        """
+        Yield the events of *run_id* after *from_seq*, including any appended
+        while iterating.  *validate* re-checks every blob against its schema;
+        pass False for bulk reads of a trusted ledger.
+        """
+        for batch in self._batches(run_id, from_seq, 1000, validate, self._row):
+            yield from batch
+
+    def replay(
+        self, run_id: str, *, batch_size: int | None = None, validate: bool | None = None
+    ) -> Iterator[EventRow] | Iterator[list[EventRecord]]:
+        """
+        Replay *run_id* from the start.
+
+        With *batch_size* yields lists of up to that many ``EventRecord``
+        tuples instead of single EventRow models.  Records expose the same
+        attributes (``header.id``, ``header.schema``, ``blob``, ``seq`` ...)
+        but skip pydantic construction, which dominates bulk replays.
+
+        *validate* re-checks every blob against its schema; it defaults to
+        True for single rows and False in batched mode.
+
+        Raises
+        ------
+        ValueError
+            If *batch_size* is smaller than 1.
+        """
+        if batch_size is not None and batch_size < 1:
+            raise ValueError(f"batch_size must be >= 1, got {batch_size}")
+        if batch_size is None:
+            return self.tail(run_id, validate=True if validate is None else validate)
+        return self._batches(run_id, 0, batch_size, bool(validate), self._record)
+
+    # ------------------------------------------------ branching
+    def fork(self, run_id: str, at_seq: int, new_run_id: str) -> None:
+        """
+        Branch *new_run_id* off *run_id* after event *at_seq*.
+
+        O(1): the child only records a pointer to its parent, the first
+        *at_seq* events are resolved from the parent on read and new events
+        are appended from ``at_seq + 1`` onwards.
+
+        Raises
+        ------
+        KeyError
+            If *run_id* does not exist.
+        ValueError
+            If *new_run_id* already exists or *at_seq* is out of range.
+        """
+        if not self._exists(run_id):
+            raise KeyError(run_id)
+        if self._exists(new_run_id):
+            raise ValueError(f"Run already exists: {new_run_id}")
+        head = self._head(run_id)
+        if not 0 <= at_seq <= head:
+            raise ValueError(f"at_seq must be within [0, {head}], got {at_seq}")
+        with self._db:
+            self._db.execute(
+                "INSERT INTO forks(run_id, parent_run, parent_seq) VALUES(?, ?, ?)",
+                (new_run_id, run_id, at_seq),
+            )
+
+    def diff(self, run_a: str, run_b: str) -> RunDiff:
+        """
+        Compare two runs by their (schema, sha) sets without loading blobs.
+        """
+        sql_a, params_a = self._events_sql(run_a)
+        sql_b, params_b = self._events_sql(run_b)
+        # one grouped pass over both runs, tagging each pair with its side(s)
+        rows = self._db.execute(
+            f"SELECT schema, sha, MAX(side = 'a'), MAX(side = 'b') FROM ("
+            f"  SELECT 'a' AS side, schema, sha FROM ({sql_a})"
+            f"  UNION ALL"
+            f"  SELECT 'b' AS side, schema, sha FROM ({sql_b})"
+            f") GROUP BY schema, sha",
+            (*params_a, *params_b),
+        ).fetchall()
+
+        only_a, only_b, shared = set(), set(), set()
+        for schema, sha, in_a, in_b in rows:
+            pair = (SchemaId(schema), Sha256(sha))
+            (shared if in_a and in_b else only_a if in_a else only_b).add(pair)
+        return RunDiff(
+            only_a=frozenset(only_a),
+            only_b=frozenset(only_b),
+            shared=frozenset(shared),
+        )
+
+    # ------------------------------------------------ queries
+    def query(
+        self,
+        *,
+        schema: SchemaId | None = None,
+        run_id: str | None = None,
+        ts_from: Timestamp | None = None,
+        ts_to: Timestamp | None = None,
+        after: tuple[int, str, int] | None = None,
+        limit: int = 100,
+    ) -> tuple[list[EventRef], tuple[int, str, int] | None]:
+        """
+        Header-only scan of the ledger, ordered by (ts, run_id, seq).
+
+        *ts_from* is inclusive, *ts_to* exclusive.  Pagination is keyset
+        based: pass the returned cursor back as *after* to fetch the next
+        page; it is ``None`` once the scan is exhausted.  Blobs are never
+        loaded.  With *run_id* the events a fork inherits are included.
+
+        Raises
+        ------
+        ValueError
+            If *limit* is smaller than 1.
+        """
+        if limit < 1:
+            raise ValueError(f"limit must be >= 1, got {limit}")
+        where, params = [], []
+        if schema is not None:
+            where.append("schema = ?")
+            params.append(schema)
+        if ts_from is not None:
+            where.append("ts >= ?")
+            params.append(ts_from)
+        if ts_to is not None:
+            where.append("ts < ?")
+            params.append(ts_to)
+
+        if run_id is None:
+            if after is not None:
+                where.append("(ts, run_id, seq) > (?, ?, ?)")
+                params.extend(after)
             rows = self._db.execute(
-                "SELECT seq,sha,schema,ts FROM events WHERE run_id=? AND seq>? ORDER BY seq",
-                (run_id, cursor),
+                "SELECT run_id, seq, sha, schema, ts FROM events"
+                + (f" WHERE {' AND '.join(where)}" if where else "")
+                + " ORDER BY ts, run_id, seq LIMIT ?",
+                (*params, limit),
             ).fetchall()
-            if not rows:
-                break
-            for seq, sha, schema, ts in rows:
-                header = EventHeader(id=sha, schema=schema, ts=ts)  # Use schema
-                blob = self.cat(sha)
-                event = EventRow(header=header, blob=blob, run_id=run_id, seq=seq)
-                
-                validator = EventValidator(event)
-                if not validator.validate():
-                    raise ValueError(f"Invalid event in database: {validator.validation_error}")
-                
-                yield event
-                cursor = seq
-
-    def replay(self, run_id: str):
-        return self.tail(run_id)
\ No newline at end of file
+        else:
+            rows = self._query_run(run_id, where, params, after, limit)
+
+        refs = [
+            EventRef(header=EventHeader(id=sha, schema=schema_, ts=ts), run_id=run, seq=seq)
+            for run, seq, sha, schema_, ts in rows
+        ]
+        cursor = (rows[-1][4], rows[-1][0], rows[-1][1]) if len(rows) == limit else None
+        return refs, cursor
+
+    def _query_run(
+        self,
+        run_id: str,
+        where: list[str],
+        params: list,
+        after: tuple[int, str, int] | None,
+        limit: int,
+    ) -> list[tuple]:
+        # every row reports *run_id*, so the (ts, run_id, seq) keyset reduces
+        # to (ts, seq) within the run
+        where = list(where)
+        params = list(params)
+        if after is not None:
+            after_ts, after_run, after_seq = after
+            if after_run == run_id:
+                where.append("(ts, seq) > (?, ?)")
+                params.extend((after_ts, after_seq))
+            else:
+                where.append("ts >= ?" if run_id > after_run else "ts > ?")
+                params.append(after_ts)
+
+        # one (run_id, ts, seq) index range per fork segment; SQLite merges
+        # the already-ordered segments and stops at the LIMIT
+        parts, seg_params = [], []
+        for seg_run, lo, hi in self._segments(run_id):
+            sql = ("SELECT ? AS run_id, seq, sha, schema, ts "
+                   "FROM events INDEXED BY events_run_ts WHERE run_id = ?")
+            p = [run_id, seg_run]
+            if lo:
+                sql += " AND seq > ?"
+                p.append(lo)
+            if hi is not None:
+                sql += " AND seq <= ?"
+                p.append(hi)
+            parts.append(" AND ".join([sql, *where]))
+            seg_params.extend([*p, *params])
+        return self._db.execute(
+            " UNION ALL ".join(parts) + " ORDER BY ts, seq LIMIT ?",
+            (*seg_params, limit),
+        ).fetchall()
+
+    # ------------------------------------------------ provenance
+    def _walk(self, sha: Sha256, src: str, dst: str) -> list[Sha256]:
+        # UNION (not UNION ALL) visits every artefact once, so shared
+        # ancestors in a DAG don't blow up the recursion
+        rows = self._db.execute(
+            f"WITH RECURSIVE walk(sha) AS ("
+            f"  SELECT {dst} FROM edges WHERE {src} = ?"
+            f"  UNION"
+            f"  SELECT e.{dst} FROM edges e JOIN walk w ON e.{src} = w.sha"
+            f") SELECT sha FROM walk",
+            (sha,),
+        ).fetchall()
+        return [Sha256(r[0]) for r in rows]
+
+    def lineage(self, sha: Sha256) -> list[Sha256]:
+        """All artefacts *sha* was derived from, nearest first."""
+        return self._walk(sha, "child", "parent")
+
+    def descendants(self, sha: Sha256) -> list[Sha256]:
+        """All artefacts derived from *sha*, nearest first."""
+        return self._walk(sha, "parent", "child")
@@ -28,14 +28,15 @@ class Reactor:
             if self._match(row.header):
                 outputs = await self.handle(row)
                 for schema, blob in outputs or []:
-                    header = EventHeader(id=self.ledger._hash(blob), schema_id=schema)
-                    output_event = EventRow(
+                    # publish() validates the payload; the envelope is ours
+                    header = EventHeader.model_construct(id=self.ledger._hash(blob), schema_id=schema)
+                    output_event = EventRow.model_construct(
                         header=header,
                         blob=blob,
                         run_id=run_id,
                         seq=0,
                     )
-                    self.ledger.publish(output_event)
+                    self.ledger.publish(output_event, parents=(row.header.id,))
         # Generator exhausted → nothing more to do
         if self._activity_event:
             self._activity_event.set()  
@@ -3,6 +3,7 @@ import json
 from typing import Dict
 import jsonschema
 from .types import SchemaId, Blob, Event
+from .tabular import ARROW_IPC, is_arrow_ipc, validate_arrow
 
 _SCHEMA_CACHE: Dict[SchemaId, dict] = {} 
 # cache to store loaded schemas. two "arguments", the type of its keys and the type 
@@ -31,6 +32,13 @@ def load_schema(schema_id: SchemaId) -> dict:
 
 def validate_schema(schema_id: SchemaId, blob: Blob) -> None:
     schema = load_schema(schema_id)
+    # tabular schemas may carry an Arrow IPC file instead of their text form
+    if schema.get("binary_encoding") == ARROW_IPC and is_arrow_ipc(blob):
+        try:
+            validate_arrow(blob)
+        except ValueError as exc:
+            raise jsonschema.exceptions.ValidationError(str(exc)) from exc
+        return
     data = blob
     if schema.get("payload_encoding") == "utf-8":
         data = blob.decode("utf-8")
@@ -0,0 +1,97 @@
+# drylab/tabular.py
+"""
+Tabular payloads: CSV (utf-8) or Arrow IPC, decoded into ``pyarrow.Table``.
+
+Arrow IPC blobs are mapped zero-copy over the blob bytes; CSV blobs are
+parsed with pyarrow's multithreaded reader.  Decoded tables are kept in a
+bounded LRU keyed by sha, so several reactors consuming the same artefact
+decode it only once.
+
+pyarrow is an optional dependency: ``pip install drylab[arrow]``.
+"""
+from __future__ import annotations
+
+import os
+from collections import OrderedDict
+
+from .types import Blob, SchemaId, Sha256
+
+TABULAR_SCHEMAS: frozenset[SchemaId] = frozenset({
+    SchemaId("COUNTS_MATRIX@1"),
+    SchemaId("DEG_TABLE@1"),
+    SchemaId("ENRICH_TABLE@1"),
+})
+
+ARROW_IPC = "arrow-ipc"
+_ARROW_MAGIC = b"ARROW1"          # leading bytes of the Arrow IPC *file* format
+
+_CACHE_BYTES = int(os.getenv("DRYLAB_TABLE_CACHE_BYTES", 256 * 1024 * 1024))
+_TABLE_CACHE: OrderedDict[Sha256, object] = OrderedDict()
+_cache_size = 0
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.csv
+        import pyarrow.dataset
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError as exc:
+        raise ImportError(
+            "Tabular payloads need pyarrow: pip install drylab[arrow]"
+        ) from exc
+    return pyarrow
+
+
+def is_arrow_ipc(blob: Blob) -> bool:
+    return blob[:len(_ARROW_MAGIC)] == _ARROW_MAGIC
+
+
+def encode_arrow(table) -> Blob:
+    """Serialise a ``pyarrow.Table`` (or pandas DataFrame) as an Arrow IPC file."""
+    pa = _pyarrow()
+    if not isinstance(table, pa.Table):
+        table = pa.Table.from_pandas(table, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    return Blob(sink.getvalue().to_pybytes())
+
+
+def _decode(blob: Blob):
+    pa = _pyarrow()
+    if is_arrow_ipc(blob):
+        return pa.ipc.open_file(pa.py_buffer(blob)).read_all()
+    return pa.csv.read_csv(pa.BufferReader(blob))
+
+
+def decode_table(sha: Sha256, blob: Blob):
+    """Decode *blob* into a ``pyarrow.Table``, reusing a cached decode of *sha*."""
+    global _cache_size
+    if sha in _TABLE_CACHE:
+        _TABLE_CACHE.move_to_end(sha)
+        return _TABLE_CACHE[sha]
+
+    table = _decode(blob)
+    if table.nbytes <= _CACHE_BYTES:
+        _TABLE_CACHE[sha] = table
+        _cache_size += table.nbytes
+        while _cache_size > _CACHE_BYTES:
+            _, evicted = _TABLE_CACHE.popitem(last=False)
+            _cache_size -= evicted.nbytes
+    return table
+
+
+def validate_arrow(blob: Blob) -> None:
+    """
+    Raises
+    ------
+    ValueError
+        If *blob* is not a readable Arrow IPC file.
+    """
+    pa = _pyarrow()
+    try:
+        pa.ipc.open_file(pa.py_buffer(blob)).read_all().validate()
+    except (pa.ArrowInvalid, OSError) as exc:
+        raise ValueError(f"Invalid Arrow IPC payload: {exc}") from exc
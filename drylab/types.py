@@ -1,7 +1,7 @@
 from __future__ import annotations # enables modern Python type hinting behavior
 import datetime as _dt # the underscore prefix suggests it's for internal use
 import hashlib # module for creating hash values (like SHA-256)
-from typing import NewType # tool from Python's typing system to create distinct types
+from typing import NamedTuple, NewType # tool from Python's typing system to create distinct types
 from pydantic import BaseModel, Field
 
 Blob      = NewType("Blob", bytes)         # raw bytes from any source. Represents raw binary data
@@ -38,6 +38,51 @@ class Event(BaseModel):
         "arbitrary_types_allowed": True,
     }
 
+    def table(self):
+        """Decode a tabular blob (CSV or Arrow IPC) into a cached ``pyarrow.Table``."""
+        from .tabular import decode_table   # pyarrow stays optional
+        return decode_table(self.header.id, self.blob)
+
 class EventRow(Event):
     run_id: str
     seq: int
+
+class HeaderRecord(NamedTuple):
+    """Tuple-backed EventHeader for bulk reads; same attributes, no validation."""
+    id: Sha256
+    schema_id: SchemaId
+    ts: Timestamp
+
+    @property
+    def schema(self) -> SchemaId:
+        return self.schema_id
+
+class EventRecord(NamedTuple):
+    """Tuple-backed EventRow for bulk reads of already-validated ledger rows."""
+    header: HeaderRecord
+    blob: Blob
+    run_id: str
+    seq: int
+
+    def table(self):
+        """Decode a tabular blob (CSV or Arrow IPC) into a cached ``pyarrow.Table``."""
+        from .tabular import decode_table   # pyarrow stays optional
+        return decode_table(self.header.id, self.blob)
+
+class EventRef(BaseModel):
+    """An event's header and position, without its blob."""
+    header: EventHeader
+    run_id: str
+    seq: int
+    model_config = {
+        "frozen": True,
+    }
+
+class RunDiff(BaseModel):
+    """(schema, sha) pairs found in only one of two runs, or in both."""
+    only_a: frozenset[tuple[SchemaId, Sha256]]
+    only_b: frozenset[tuple[SchemaId, Sha256]]
+    shared: frozenset[tuple[SchemaId, Sha256]]
+    model_config = {
+        "frozen": True,
+    }
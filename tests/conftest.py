@@ -0,0 +1,34 @@
+import asyncio
+
+import pytest
+
+from drylab import Blob, EventHeader, EventRow, Ledger, SchemaId
+
+SEQ = SchemaId("SEQ_PDB@1")
+
+
+@pytest.fixture
+def ledger() -> Ledger:
+    return Ledger()
+
+
+@pytest.fixture
+def publish(ledger):
+    """publish(run_id, *payloads, schema=SEQ, parents=()) -> list of publish() results."""
+    def _publish(run_id, *payloads, schema=SEQ, parents=()):
+        # Ledger.publish schedules a notification task, so it needs a loop
+        async def _go():
+            return [
+                ledger.publish(
+                    EventRow(
+                        header=EventHeader(id=ledger._hash(Blob(p)), schema=schema),
+                        blob=Blob(p),
+                        run_id=run_id,
+                        seq=0,
+                    ),
+                    parents=parents,
+                )
+                for p in payloads
+            ]
+        return asyncio.run(_go())
+    return _publish
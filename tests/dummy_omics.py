@@ -1,5 +1,5 @@
 import io, csv, statistics, textwrap, asyncio, pandas as pd
-from drylab import Pipeline, Reactor, SchemaId, Blob, EventRow, EventHeader
+from drylab import Pipeline, Reactor, SchemaId, Blob, EventRow, EventHeader, encode_arrow
 from drylab.llms.gemini import GoogleGemini
 
 FASTQ   = SchemaId("FASTQ_RAW@1")
@@ -27,25 +27,23 @@ class DiffExprReactor(Reactor):
     pattern = {"schema": COUNTS}
 
     async def handle(self, ev: EventRow):
-        counts = pd.read_csv(io.StringIO(ev.blob.decode()))
+        counts = ev.table().to_pandas()
         # fake DE calculation
         degs = counts.head(100)                # demo subset
-        buf = io.StringIO(); degs.to_csv(buf, index=False)
-        print("DiffExprReactor before publish: ", buf.getvalue())
-        return [(DEGS, Blob(buf.getvalue().encode()))]
+        print("DiffExprReactor before publish: ", degs)
+        return [(DEGS, encode_arrow(degs))]
 
 # ------------------------------------------------------------------ #
 class EnrichReactor(Reactor):
     pattern = {"schema": DEGS}
 
     async def handle(self, ev: EventRow):
-        degs = pd.read_csv(io.StringIO(ev.blob.decode()))
+        degs = ev.table().to_pandas()
         enr = degs[["gene"]].copy()
         enr["Term"] = "Pathway_X"
         enr["Adjusted P-value"] = 0.05
-        buf = io.StringIO(); enr.to_csv(buf, index=False)
-        print("EnrichReactor before publish: ", buf.getvalue())
-        return [(ENRICH, Blob(buf.getvalue().encode()))]
+        print("EnrichReactor before publish: ", enr)
+        return [(ENRICH, encode_arrow(enr))]
 
 # ------------------------------------------------------------------ #
 class LLMReportReactor(Reactor):
@@ -56,7 +54,7 @@ class LLMReportReactor(Reactor):
         self.llm = GoogleGemini(ledger)
 
     async def handle(self, ev: EventRow):
-        enr_tbl = pd.read_csv(io.StringIO(ev.blob.decode()))
+        enr_tbl = ev.table().to_pandas()
         top = enr_tbl[["Term", "Adjusted P-value"]].head(10).to_dict("records")
 
         summary = await self.llm.chat([
@@ -0,0 +1,140 @@
+import sqlite3
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+import pyarrow.dataset  # noqa: E402
+import pyarrow.parquet as pq  # noqa: E402
+
+from drylab import Ledger, SchemaId, export_parquet, import_parquet  # noqa: E402
+
+COUNTS = SchemaId("COUNTS_MATRIX@1")
+
+
+@pytest.fixture
+def exported(ledger, publish, tmp_path):
+    h = ledger._hash
+    publish("r", b"a", b"b", b"c")
+    publish("r", b"gene,s1\nTP53,1\nACTA2,2\n", schema=COUNTS, parents=[h(b"a")])
+    ledger.fork("r", 2, "f")
+    publish("f", b"x")
+    export_parquet(ledger, tmp_path, tables=True, batch_size=2)
+    return tmp_path
+
+
+def snapshot(ledger):
+    return {
+        table: sorted(ledger._db.execute(f"SELECT * FROM {table}").fetchall())
+        for table in ("events", "blobs", "forks", "edges")
+    }
+
+
+def test_round_trip(ledger, exported):
+    target = Ledger()
+
+    assert import_parquet(target, exported) == 5
+    assert snapshot(target) == snapshot(ledger)
+    assert [r.blob for r in target.tail("f")] == [b"a", b"b", b"x"]
+
+
+def test_tables_written_per_schema(ledger, exported):
+    table = pa.dataset.dataset(exported / "tables" / "COUNTS_MATRIX.v1").to_table()
+
+    assert table.column("gene").to_pylist() == ["TP53", "ACTA2"]
+    assert set(table.column("sha").to_pylist()) == {
+        ledger._hash(b"gene,s1\nTP53,1\nACTA2,2\n")
+    }
+
+
+def test_tables_unify_columns_across_payloads(ledger, publish, tmp_path):
+    h = ledger._hash
+    first, second = b"gene,s1\nTP53,1\n", b"gene,s2,s3\nACTA2,2.5,x\nMYC,3,y\n"
+    clash = b"gene,s1\nBRCA1,high\n"               # s1 is an int above
+    publish("a", first, schema=COUNTS)
+    publish("b", second, clash, schema=COUNTS)
+    export_parquet(ledger, tmp_path, tables=True, batch_size=1)
+
+    dataset = tmp_path / "tables" / "COUNTS_MATRIX.v1"
+    table = pa.dataset.dataset(dataset).to_table().sort_by("gene")
+
+    assert len(list(dataset.iterdir())) == 1
+    assert table.schema.names == ["gene", "s1", "s2", "s3", "sha"]
+    assert table.schema.field("s2").type == pa.float64()
+    assert table.to_pylist() == [
+        {"gene": "ACTA2", "s1": None, "s2": 2.5, "s3": "x", "sha": h(second)},
+        {"gene": "BRCA1", "s1": "high", "s2": None, "s3": None, "sha": h(clash)},
+        {"gene": "MYC", "s1": None, "s2": 3.0, "s3": "y", "sha": h(second)},
+        {"gene": "TP53", "s1": "1", "s2": None, "s3": None, "sha": h(first)},
+    ]
+
+
+def test_existing_run_is_rejected(exported):
+    target = Ledger()
+    target._db.execute("INSERT INTO blobs VALUES ('s', x'00')")
+    target._db.execute("INSERT INTO events VALUES ('r', 1, 's', 'SEQ_PDB@1', 0)")
+
+    with pytest.raises(ValueError, match="already exist"):
+        import_parquet(target, exported)
+    assert target._db.execute("SELECT COUNT(*) FROM events").fetchone()[0] == 1
+
+
+def test_skip_existing_runs_also_skips_their_forks(exported):
+    target = Ledger()
+    target._db.execute("INSERT INTO blobs VALUES ('s', x'00')")
+    target._db.execute("INSERT INTO events VALUES ('r', 1, 's', 'SEQ_PDB@1', 0)")
+
+    assert import_parquet(target, exported, skip_existing_runs=True) == 0
+    assert target._db.execute("SELECT COUNT(*) FROM forks").fetchone()[0] == 0
+
+
+def test_missing_blob_is_rejected(exported):
+    (exported / "blobs.parquet").unlink()
+    target = Ledger()
+
+    with pytest.raises(ValueError, match="missing blob"):
+        import_parquet(target, exported)
+    assert target._db.execute("SELECT COUNT(*) FROM events").fetchone()[0] == 0
+
+
+def test_corrupt_blob_is_rejected(exported):
+    blobs = pq.read_table(exported / "blobs.parquet").to_pylist()
+    blobs[0]["bytes"] = b"tampered"
+    pq.write_table(pa.Table.from_pylist(blobs, schema=pq.read_schema(exported / "blobs.parquet")),
+                   exported / "blobs.parquet")
+
+    with pytest.raises(ValueError, match="does not match"):
+        import_parquet(Ledger(), exported)
+
+
+@pytest.mark.parametrize("batch_size", [0, -1])
+def test_rejects_non_positive_batch_size(ledger, tmp_path, batch_size):
+    with pytest.raises(ValueError, match="batch_size"):
+        export_parquet(ledger, tmp_path, batch_size=batch_size)
+    with pytest.raises(ValueError, match="batch_size"):
+        import_parquet(Ledger(), tmp_path, batch_size=batch_size)
+
+
+def test_export_reads_one_snapshot(tmp_path):
+    db = tmp_path / "ledger.db"
+    ledger = Ledger(db)
+    writer = sqlite3.connect(db)
+
+    def write_midway(sql):
+        # once events.parquet is done, another connection commits new rows
+        if sql.startswith("SELECT sha, bytes FROM blobs") and not writer.in_transaction:
+            with writer:
+                writer.execute("INSERT INTO blobs VALUES ('late', x'00')")
+                writer.execute("INSERT INTO events VALUES ('r', 99, 'late', 'SEQ_PDB@1', 0)")
+                writer.execute("INSERT INTO edges VALUES ('late', 'x')")
+
+    ledger._db.execute("INSERT INTO blobs VALUES ('s', x'00')")
+    ledger._db.execute("INSERT INTO events VALUES ('r', 1, 's', 'SEQ_PDB@1', 0)")
+    ledger._db.commit()
+    ledger._db.set_trace_callback(write_midway)
+    export_parquet(ledger, tmp_path / "out")
+    ledger._db.set_trace_callback(None)
+
+    out = tmp_path / "out"
+    assert pq.read_table(out / "blobs.parquet").column("sha").to_pylist() == ["s"]
+    assert pq.read_table(out / "edges.parquet").num_rows == 0
+    assert ledger._db.execute("SELECT COUNT(*) FROM edges").fetchone()[0] == 1
@@ -0,0 +1,100 @@
+import pytest
+
+from drylab import SchemaId
+
+SEQ = SchemaId("SEQ_PDB@1")
+
+
+def blobs(rows):
+    return [(r.seq, r.blob) for r in rows]
+
+
+def test_fork_inherits_prefix_without_copying(ledger, publish):
+    publish("p", b"a", b"b", b"c", b"d")
+    ledger.fork("p", 2, "c")
+
+    assert blobs(ledger.tail("c")) == [(1, b"a"), (2, b"b")]
+    assert ledger._db.execute("SELECT COUNT(*) FROM events WHERE run_id='c'").fetchone()[0] == 0
+
+
+def test_fork_appends_after_fork_point_and_isolates_parent(ledger, publish):
+    publish("p", b"a", b"b", b"c")
+    ledger.fork("p", 2, "c")
+    publish("c", b"x")
+    publish("p", b"y")
+
+    assert blobs(ledger.tail("c")) == [(1, b"a"), (2, b"b"), (3, b"x")]
+    assert blobs(ledger.tail("p")) == [(1, b"a"), (2, b"b"), (3, b"c"), (4, b"y")]
+
+
+def test_fork_dedup_includes_inherited_events(ledger, publish):
+    publish("p", b"a", b"b", b"c")
+    ledger.fork("p", 2, "c")
+
+    assert publish("c", b"a", b"c") == [False, True]
+
+
+def test_nested_fork(ledger, publish):
+    publish("g", b"a", b"b", b"c")
+    ledger.fork("g", 2, "p")
+    publish("p", b"p3", b"p4")
+    ledger.fork("p", 3, "c")
+    publish("c", b"c4")
+
+    assert blobs(ledger.tail("c")) == [(1, b"a"), (2, b"b"), (3, b"p3"), (4, b"c4")]
+    assert blobs(ledger.tail("c", 2)) == [(3, b"p3"), (4, b"c4")]
+
+
+def test_fork_below_parents_own_fork_point(ledger, publish):
+    publish("g", b"a", b"b", b"c")
+    ledger.fork("g", 2, "p")
+    publish("p", b"p3")
+    ledger.fork("p", 1, "c")
+
+    assert blobs(ledger.tail("c")) == [(1, b"a")]
+    publish("c", b"c2")
+    assert blobs(ledger.tail("c")) == [(1, b"a"), (2, b"c2")]
+
+
+def test_fork_errors(ledger, publish):
+    publish("p", b"a", b"b")
+    ledger.fork("p", 1, "c")
+
+    with pytest.raises(KeyError):
+        ledger.fork("missing", 0, "x")
+    with pytest.raises(ValueError):
+        ledger.fork("p", 3, "x")
+    with pytest.raises(ValueError):
+        ledger.fork("p", -1, "x")
+    with pytest.raises(ValueError):
+        ledger.fork("p", 1, "c")
+
+
+def test_diff(ledger, publish):
+    publish("p", b"a", b"b", b"c")
+    ledger.fork("p", 2, "c")
+    publish("c", b"x")
+    h = ledger._hash
+
+    diff = ledger.diff("p", "c")
+
+    assert diff.only_a == {(SEQ, h(b"c"))}
+    assert diff.only_b == {(SEQ, h(b"x"))}
+    assert diff.shared == {(SEQ, h(b"a")), (SEQ, h(b"b"))}
+
+
+def test_duplicate_check_uses_index(ledger, publish):
+    publish("p", b"a", b"b")
+    ledger.fork("p", 1, "c")
+    statements = []
+    ledger._db.set_trace_callback(statements.append)   # SQL with values bound
+    assert ledger._contains("c", SEQ, ledger._hash(b"a"))
+    assert not ledger._contains("c", SEQ, ledger._hash(b"b"))
+    ledger._db.set_trace_callback(None)
+
+    probes = [s for s in statements if "INDEXED BY" in s]
+    assert len(probes) == 2
+    for sql in probes:
+        plan = ledger._db.execute("EXPLAIN QUERY PLAN " + sql).fetchall()
+        searches = [row[-1] for row in plan if row[-1].startswith("SEARCH")]
+        assert searches and all("events_run_schema_sha" in s for s in searches)
@@ -0,0 +1,68 @@
+import asyncio
+import sqlite3
+
+import pytest
+
+from drylab import Blob, EventHeader, EventRow, Reactor, SchemaId
+
+SEQ = SchemaId("SEQ_PDB@1")
+REP = SchemaId("REPORT_MD@1")
+
+
+def test_lineage_and_descendants(ledger, publish):
+    h = ledger._hash
+    publish("r", b"raw")
+    publish("r", b"mid", parents=[h(b"raw")])
+    publish("r", b"out", parents=[h(b"mid")])
+
+    assert ledger.lineage(h(b"out")) == [h(b"mid"), h(b"raw")]
+    assert ledger.descendants(h(b"raw")) == [h(b"mid"), h(b"out")]
+    assert ledger.lineage(h(b"raw")) == []
+
+
+def test_diamond_visits_each_artefact_once(ledger, publish):
+    h = ledger._hash
+    publish("r", b"root")
+    publish("r", b"left", b"right", parents=[h(b"root")])
+    publish("r", b"join", parents=[h(b"left"), h(b"right")])
+
+    assert sorted(ledger.lineage(h(b"join"))) == sorted([h(b"left"), h(b"right"), h(b"root")])
+    assert sorted(ledger.descendants(h(b"root"))) == sorted([h(b"left"), h(b"right"), h(b"join")])
+
+
+def test_duplicate_event_still_records_edge(ledger, publish):
+    h = ledger._hash
+    publish("r", b"a", b"b", b"out")
+
+    assert publish("r", b"out", parents=[h(b"a")]) == [False]
+    assert ledger.lineage(h(b"out")) == [h(b"a")]
+
+
+def test_failed_insert_leaves_no_edges(ledger, publish):
+    ledger._db.execute("CREATE TRIGGER boom BEFORE INSERT ON events BEGIN SELECT RAISE(ABORT, 'boom'); END")
+    with pytest.raises(sqlite3.IntegrityError):
+        publish("r", b"out", parents=["parent"])
+
+    assert ledger._db.execute("SELECT COUNT(*) FROM edges").fetchone()[0] == 0
+
+
+def test_reactor_links_outputs_to_input(ledger):
+    class Report(Reactor):
+        pattern = {"schema": SEQ}
+
+        async def handle(self, ev):
+            return [(REP, Blob(b"report of " + ev.blob))]
+
+    async def main():
+        task = asyncio.create_task(Report(ledger).run("r"))
+        blob = Blob(b"FAKEPDB")
+        ledger.publish(EventRow(header=EventHeader(id=ledger._hash(blob), schema=SEQ),
+                                blob=blob, run_id="r", seq=0))
+        for _ in range(50):
+            await asyncio.sleep(0.01)
+            if ledger.descendants(ledger._hash(blob)):
+                break
+        task.cancel()
+
+    asyncio.run(main())
+    assert ledger.descendants(ledger._hash(b"FAKEPDB")) == [ledger._hash(b"report of FAKEPDB")]
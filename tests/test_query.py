@@ -0,0 +1,110 @@
+import pytest
+
+from drylab import SchemaId
+
+SEQ = SchemaId("SEQ_PDB@1")
+FASTQ = SchemaId("FASTQ_RAW@1")
+
+
+def set_ts(ledger, run_id, seq, ts):
+    with ledger._db:
+        ledger._db.execute("UPDATE events SET ts=? WHERE run_id=? AND seq=?", (ts, run_id, seq))
+
+
+def pages(ledger, **kw):
+    out, cursor = [], None
+    while True:
+        refs, cursor = ledger.query(after=cursor, **kw)
+        out.append([(r.run_id, r.seq) for r in refs])
+        if cursor is None:
+            return out
+
+
+def test_keyset_pagination_covers_every_event_once(ledger, publish):
+    publish("a", b"a1", b"a2", b"a3")
+    publish("b", b"b1", b"b2")
+    for run, seq, ts in [("a", 1, 10), ("a", 2, 30), ("a", 3, 20), ("b", 1, 20), ("b", 2, 10)]:
+        set_ts(ledger, run, seq, ts)
+
+    result = pages(ledger, limit=2)
+
+    assert result == [[("a", 1), ("b", 2)], [("a", 3), ("b", 1)], [("a", 2)]]
+
+
+def test_filters_by_schema_and_time_range(ledger, publish):
+    publish("a", b"seq1", b"seq2")
+    publish("a", b"fastq-read", schema=FASTQ)
+    for seq, ts in [(1, 100), (2, 200), (3, 150)]:
+        set_ts(ledger, "a", seq, ts)
+
+    refs, cursor = ledger.query(schema=SEQ, ts_from=100, ts_to=200)
+
+    assert [(r.seq, r.header.schema, r.header.ts) for r in refs] == [(1, SEQ, 100)]
+    assert cursor is None
+
+
+def test_run_id_includes_inherited_events(ledger, publish):
+    publish("p", b"a", b"b", b"c")
+    ledger.fork("p", 2, "c")
+    publish("c", b"x")
+
+    refs, _ = ledger.query(run_id="c")
+
+    assert [(r.run_id, r.seq) for r in refs] == [("c", 1), ("c", 2), ("c", 3)]
+
+
+def test_query_does_not_load_blobs(ledger, publish):
+    publish("a", b"a1")
+    refs, _ = ledger.query()
+
+    assert not hasattr(refs[0], "blob")
+    assert refs[0].header.id == ledger._hash(b"a1")
+
+
+def test_schema_scan_uses_index(ledger, publish):
+    publish("a", b"a1")
+    statements = []
+    ledger._db.set_trace_callback(statements.append)   # SQL with values bound
+    ledger.query(schema=SEQ, ts_from=0, after=(0, "", 0), limit=5)
+    ledger._db.set_trace_callback(None)
+
+    plan = ledger._db.execute("EXPLAIN QUERY PLAN " + statements[-1]).fetchall()
+    details = " ".join(row[-1] for row in plan)
+
+    assert "events_schema_ts" in details
+    assert "TEMP B-TREE" not in details
+
+
+@pytest.mark.parametrize("schema", [None, SEQ])
+def test_run_scan_uses_index(ledger, publish, schema):
+    publish("p", b"a", b"b")
+    ledger.fork("p", 1, "c")
+    statements = []
+    ledger._db.set_trace_callback(statements.append)
+    ledger.query(run_id="c", schema=schema, ts_from=0, after=(0, "c", 0), limit=5)
+    ledger._db.set_trace_callback(None)
+
+    plan = ledger._db.execute("EXPLAIN QUERY PLAN " + statements[-1]).fetchall()
+    details = " ".join(row[-1] for row in plan)
+
+    assert "events_run_ts" in details
+    assert "TEMP B-TREE" not in details
+    assert "SCAN" not in details
+
+
+def test_run_pagination_across_fork_segments(ledger, publish):
+    publish("p", b"a", b"b", b"c")
+    ledger.fork("p", 2, "c")
+    publish("c", b"x", b"y")
+    for run, seq, ts in [("p", 1, 30), ("p", 2, 10), ("c", 3, 20), ("c", 4, 10)]:
+        set_ts(ledger, run, seq, ts)
+
+    result = pages(ledger, run_id="c", limit=2)
+
+    assert result == [[("c", 2), ("c", 4)], [("c", 3), ("c", 1)], []]
+
+
+@pytest.mark.parametrize("limit", [0, -1])
+def test_rejects_non_positive_limit(ledger, limit):
+    with pytest.raises(ValueError):
+        ledger.query(limit=limit)
@@ -0,0 +1,83 @@
+import pytest
+
+from drylab import EventRecord, EventRow, EventValidator, SchemaId
+
+SEQ = SchemaId("SEQ_PDB@1")
+
+
+def test_batched_replay_yields_record_chunks(ledger, publish):
+    publish("r", b"a", b"b", b"c", b"d", b"e")
+
+    batches = list(ledger.replay("r", batch_size=2))
+
+    assert [len(b) for b in batches] == [2, 2, 1]
+    first = batches[0][0]
+    assert isinstance(first, EventRecord)
+    assert (first.seq, first.run_id, first.blob) == (1, "r", b"a")
+    assert (first.header.id, first.header.schema, first.header.schema_id) == (ledger._hash(b"a"), SEQ, SEQ)
+
+
+def test_records_match_rows(ledger, publish):
+    publish("r", b"a", b"b", b"c")
+
+    rows = list(ledger.replay("r"))
+    records = [rec for batch in ledger.replay("r", batch_size=10) for rec in batch]
+
+    assert all(isinstance(r, EventRow) for r in rows)
+    assert [(r.seq, r.blob, r.header.id, r.header.schema, r.header.ts) for r in rows] == \
+           [(r.seq, r.blob, r.header.id, r.header.schema, r.header.ts) for r in records]
+
+
+def test_batched_replay_resolves_forks(ledger, publish):
+    publish("p", b"a", b"b", b"c")
+    ledger.fork("p", 2, "c")
+    publish("c", b"x")
+
+    batches = list(ledger.replay("c", batch_size=2))
+
+    assert [[r.blob for r in b] for b in batches] == [[b"a", b"b"], [b"x"]]
+
+
+def test_batched_replay_skips_validation_by_default(ledger, publish, monkeypatch):
+    publish("r", b"a")
+    calls = []
+
+    class CountingValidator(EventValidator):
+        def validate(self):
+            calls.append(self.event)
+            return super().validate()
+
+    monkeypatch.setattr("drylab.ledger.EventValidator", CountingValidator)
+
+    list(ledger.replay("r", batch_size=10))
+    assert calls == []
+
+    list(ledger.replay("r", batch_size=10, validate=True))
+    assert len(calls) == 1
+
+
+def test_single_row_replay_validates_stored_blobs(ledger):
+    ledger._db.execute("INSERT INTO blobs VALUES ('s', x'00')")
+    ledger._db.execute("INSERT INTO events VALUES ('r', 1, 's', 'FASTQ_RAW@1', 0)")
+
+    with pytest.raises(ValueError, match="Invalid event in database"):
+        list(ledger.replay("r"))
+    assert [r.seq for r in ledger.replay("r", validate=False)] == [1]
+
+
+def test_missing_blob_raises_key_error(ledger, publish):
+    publish("r", b"a")
+    ledger._db.execute("DELETE FROM blobs")
+
+    with pytest.raises(KeyError):
+        list(ledger.tail("r"))
+    with pytest.raises(KeyError):
+        list(ledger.replay("r", batch_size=10))
+
+
+@pytest.mark.parametrize("batch_size", [0, -1])
+def test_rejects_non_positive_batch_size(ledger, publish, batch_size):
+    publish("r", b"a")
+
+    with pytest.raises(ValueError, match="batch_size"):
+        ledger.replay("r", batch_size=batch_size)
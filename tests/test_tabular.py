@@ -0,0 +1,55 @@
+import jsonschema
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+
+from drylab import SchemaId, encode_arrow, validate_schema  # noqa: E402
+from drylab import tabular  # noqa: E402
+
+DEGS = SchemaId("DEG_TABLE@1")
+
+
+@pytest.fixture(autouse=True)
+def empty_cache(monkeypatch):
+    monkeypatch.setattr(tabular, "_TABLE_CACHE", type(tabular._TABLE_CACHE)())
+    monkeypatch.setattr(tabular, "_cache_size", 0)
+
+
+def table():
+    return pa.table({"gene": ["TP53", "ACTA2"], "log2fc": [1.5, -0.5]})
+
+
+def test_arrow_payload_validates_for_tabular_schema():
+    validate_schema(DEGS, encode_arrow(table()))
+
+
+def test_corrupt_arrow_payload_is_rejected():
+    with pytest.raises(jsonschema.exceptions.ValidationError):
+        validate_schema(DEGS, b"ARROW1" + b"\0" * 64)
+
+
+def test_publish_and_decode_both_encodings(ledger, publish):
+    publish("r", encode_arrow(table()), b"gene,log2fc\nTP53,1.5\n", schema=DEGS)
+
+    arrow_row, csv_row = list(ledger.tail("r"))
+
+    assert arrow_row.table().equals(table())
+    assert csv_row.table().column("gene").to_pylist() == ["TP53"]
+
+
+def test_decode_is_cached_per_sha():
+    blob = encode_arrow(table())
+
+    assert tabular.decode_table("sha", blob) is tabular.decode_table("sha", blob)
+
+
+def test_cache_is_bounded(monkeypatch):
+    blob = encode_arrow(table())
+    size = tabular._decode(blob).nbytes
+    monkeypatch.setattr(tabular, "_CACHE_BYTES", size * 2)
+
+    for sha in ("a", "b", "c"):
+        tabular.decode_table(sha, blob)
+
+    assert list(tabular._TABLE_CACHE) == ["b", "c"]
+    assert tabular._cache_size == size * 2